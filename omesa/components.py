@@ -4,7 +4,6 @@
 # pylint:       disable=E1135,E1101
 
 from multiprocessing import Pool
-from operator import itemgetter
 from time import time
 
 import numpy as np
@@ -13,12 +12,26 @@ from sklearn import pipeline
 from sklearn import metrics
 from sklearn.preprocessing import LabelEncoder
 from sklearn.feature_extraction import DictVectorizer
+from sklearn.feature_extraction import FeatureHasher
 from sklearn.model_selection import GridSearchCV
 from sklearn.model_selection import cross_val_predict
 from sklearn.model_selection import train_test_split
 
 from .featurizer import Featurizer
-from .containers import Pipe, _chain
+from .containers import _chain
+
+_FEATURIZER = None
+
+
+def _init_worker(featurizer):
+    """Give a pool worker its own featurizer, pickled once per process."""
+    global _FEATURIZER
+    _FEATURIZER = featurizer
+
+
+def _featurize(instance):
+    """Transform an instance with the featurizer of this worker."""
+    return _FEATURIZER.transform(instance)
 
 
 class Vectorizer(object):
@@ -37,12 +50,27 @@ class Vectorizer(object):
     preprocessor: Preprocessor class.
 
     parser: Parser class.
+
+    hashing: bool, optional, default False
+        Hash features to columns instead of keeping a feature vocabulary.
+        Uses constant memory for any amount of n-grams, but feature names
+        can not be recovered. Colliding features are summed, so values stay
+        non-negative (e.g. for MultinomialNB or chi2).
+
+    n_features: int, optional, default 2 ** 20
+        Number of columns to hash into, only used if hashing is set.
     """
 
-    def __init__(self, features, preprocessor=None, parser=None, n_jobs=None):
+    def __init__(self, features, preprocessor=None, parser=None, n_jobs=None,
+                 hashing=False, n_features=2 ** 20):
         """Start pipeline modules."""
         self.featurizer = Featurizer(features, preprocessor, parser)
-        self.hasher = DictVectorizer()
+        # NOTE: counts and simple stats are exact enough in single precision
+        if hashing:
+            self.hasher = FeatureHasher(n_features, dtype=np.float32,
+                                        alternate_sign=False)
+        else:
+            self.hasher = DictVectorizer(dtype=np.float32)
         self.encoder = LabelEncoder()
         self.n_jobs = n_jobs
 
@@ -52,8 +80,9 @@ class Vectorizer(object):
             data = _chain(data)
 
         if self.n_jobs != 1:
-            p = Pool(processes=self.n_jobs)
-            D, y = zip(*p.map(self.featurizer.transform, data))
+            p = Pool(processes=self.n_jobs, initializer=_init_worker,
+                     initargs=(self.featurizer, ))
+            D, y = zip(*p.map(_featurize, data))
             p.close()
             p.join()
             del p
@@ -146,17 +146,16 @@ class Pipeline(object):
         if 'json' in self.storage:
             sr.encode(top, open(self.hook + '.json', 'w'))
         if 'pickle' in self.storage:
-            for t in ('train', 'test', 'lime'):
-                c = top['conf']['{0}_data'].format(t)
-                c = '' if isinstance(c, GeneratorType) else c
             pickle.dump(top, open(fl + '.pickle', 'wb'))
         if 'db' in self.storage:
             top = {Configuration: self.cnf, Vectorizer: self.vec,
                    Classifier: self.clf, Results: self.res, Table: tab}
+            docs = []
             for doc, bind in top.items():
                 js = json.loads(sr.encode(bind))
                 js['name'] = self.hook
-                self.db.save(doc(js))
+                docs.append(doc(js))
+            self.db.save_many(docs)
 
     def load(self):
         """Load experiment and classifier from source specified."""
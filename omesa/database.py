@@ -44,15 +44,17 @@ class Table(Document):
 class Database(object):
     """Blitzdb database."""
 
+    path = expanduser("~/.omesa/db")
+
     def __init__(self):
         """Load backend."""
-        self.db = FileBackend(expanduser("~/.omesa/db"))
+        self.db = FileBackend(self.path)
 
     def _query(self, f, q):
         try:
             out = f(*q)
         except KeyError:
-            self.db = FileBackend(expanduser("~/.omesa/db"))
+            self.db = FileBackend(self.path)
             f = self.db.filter
             out = f(*q)
         return out
@@ -62,6 +64,12 @@ class Database(object):
         self.db.save(doc)
         self.db.commit()
 
+    def save_many(self, docs):
+        """Save multiple documents to db, commit only once."""
+        for doc in docs:
+            self.db.save(doc)
+        self.db.commit()
+
     def fetch(self, doc, q):
         """Filter and return first entry."""
         try:
@@ -79,6 +87,10 @@ class Database(object):
             print(str(doc), {'name': name})
             print("File does not exist.")
 
+    def iter_all(self, doc):
+        """Returns all entries in db as lazy query set."""
+        return self._query(self.db.filter, (doc, {}))
+
     def getall(self, doc):
         """Returns all entries in db."""
-        return [d for d in self._query(self.db.filter, (doc, {}))]
+        return list(self.iter_all(doc))
@@ -11,13 +11,41 @@ framework.
 import re
 import os
 import json
-import pickle
-from collections import OrderedDict, Counter
+from string import ascii_letters
+from itertools import islice
+from functools import lru_cache
+from collections import Counter
 from urllib.parse import urlencode
 
 import numpy as np
 
 
+class _Parse(list):
+    """Parse of one document that remembers its columns.
+
+    Featurizer wraps parses in this class so that helpers asking for the same
+    column (e.g. tokens or POS tags) share a single pass over the document.
+    """
+
+    def __init__(self, parse):
+        """Copy the rows and start an empty column cache."""
+        super().__init__(parse)
+        self.columns = {}
+
+    def column(self, i):
+        """Return (and cache) the i-th item of every row."""
+        if i not in self.columns:
+            self.columns[i] = [row[i] for row in self]
+        return self.columns[i]
+
+
+def _column(parse, i):
+    """Get column i from a parse, shared if Featurizer wrapped it."""
+    if isinstance(parse, _Parse):
+        return parse.column(i)
+    return [row[i] for row in parse]
+
+
 class Featurizer(object):
     """Wrapper for looping feature extractors in fit and transform operations.
 
@@ -69,7 +97,6 @@ class Featurizer(object):
         self.helpers = features
         self.preprocessor = preprocessor
         self.parser = parser
-        self.head = []
 
     def transform(self, instance):
         """Call all the helpers to extract features.
@@ -92,15 +119,17 @@ class Featurizer(object):
         text = self.preprocessor.clean(raw) if self.preprocessor else raw
         if not parse and self.parser:
             parse = self.parser.parse(raw if self.parser.raw else text)
+        if isinstance(parse, list):
+            parse = _Parse(parse)
 
         v = {}
         for helper in self.helpers:
             v.update(helper.transform(text, parse))
         if meta:
-            for name, value in meta:
-                v.update({"meta_" + name: value})
+            v.update(("meta_" + name, value) for name, value in meta)
 
-        return v, label
+        # NOTE: zero values would be stored explicitly in the sparse matrix
+        return {k: x for k, x in v.items() if x != 0}, label
 
 
 class Ngrams(object):
@@ -133,8 +162,7 @@ class Ngrams(object):
         self.name = level+'_ngram'
         self.n_list = [2] if not n_list else n_list
         self.level = level
-        self.row = 0 if level is 'token' else 2
-        self.index, self.counter = 0, 0
+        self.row = 0 if level == 'token' else 2
 
     def __str__(self):
         """Report on feature settings."""
@@ -146,10 +174,11 @@ class Ngrams(object):
         """Magic n-gram function.
 
         Calculate n-grams from a list of tokens/characters with added begin and
-        end items. Based on the implementation by Scott Triglia.
+        end items. Based on the implementation by Scott Triglia. The shifted
+        views are iterators, so only the padded list itself is copied.
         """
         inp = [''] * n + input_list + [''] * n
-        return zip(*[inp[i:] for i in range(n)])
+        return zip(*[islice(inp, i, None) for i in range(n)])
 
     def transform(self, raw, parse=None):
         """Given a document, return level-grams as Counter dict."""
@@ -158,15 +187,16 @@ class Ngrams(object):
         elif self.level == 'text':
             needle = raw.split(' ')
         elif self.level == 'token' or self.level == 'pos':
-            # FIXME: parses are not handled well
-            needle = parse[self.row] if parse else raw.split(' ')
+            needle = _column(parse, self.row) if parse else raw.split(' ')
             if self.level == 'pos' and not parse:
                 raise EnvironmentError("There's no POS annotation.")
 
-        c = Counter()
+        c, prefix = Counter(), self.level + "-"
         for n in self.n_list:
-            c += Counter([self.level+"-"+"_".join(item) for
-                          item in self.find_ngrams(needle, n)])
+            # NOTE: update in place; c += Counter() rebuilds c for every n.
+            # The map chain keeps key construction out of the Python loop.
+            c.update(map(prefix.__add__,
+                         map("_".join, self.find_ngrams(needle, n))))
         return c
 
 
@@ -207,6 +237,18 @@ class WordEmbeddings(object):
         return self.r.transform(raw.split(' '))
 
 
+_FUNCTORS_NL = {
+    'VNW': 'pronouns', 'LID': 'determiners', 'VZ': 'prepositions',
+    'BW': 'adverbs', 'TW': 'quantifiers', 'VG': 'conjunction'}
+
+
+@lru_cache(maxsize=None)
+def _functor_pattern(heads):
+    """Compile (once) a pattern matching a functor tag head, bare or with (."""
+    return re.compile(r'(?:{0})(?:\(|$)'.format(
+        '|'.join(map(re.escape, heads))))
+
+
 class FuncWords(object):
     """Extract function word frequencies.
 
@@ -224,17 +266,14 @@ class FuncWords(object):
         self.name = 'func_words'
 
         if lang == 'nl':
-            self.functors = {
-                'VNW': 'pronouns', 'LID': 'determiners', 'VZ': 'prepositions',
-                'BW': 'adverbs', 'TW': 'quantifiers', 'VG': 'conjunction'}
+            self.functors = dict(_FUNCTORS_NL)
         else:
             raise NotImplementedError
 
     def transform(self, _, parse):
         """Extract frequencies for fitted function word possibilites."""
-        tokens = [item[0] for item in parse if item[2].split('(')[0]
-                  in self.functors]
-        return Counter(tokens)
+        is_functor = _functor_pattern(tuple(self.functors)).match
+        return Counter(item[0] for item in parse if is_functor(item[2]))
 
 
 class APISent(object):
@@ -299,6 +338,17 @@ class APISent(object):
         return out
 
 
+# NOTE: alternatives are tried in order of priority, the group name of the
+# first one that matches maps to (word, lemma) lexicon tags
+_SENT_TAGS = re.compile(
+    r'(?P<f>SPEC\(vreemd\))|(?P<b>BW\(\))|(?P<n>N\()|(?P<i>TWS\(\))|'
+    r'(?P<a>ADJ\()|(?P<av>WW\((?:od|vd).*(?:,prenom|,vrij))|'
+    r'(?P<nv>WW\((?:od|vd).*,nom|WW\(inf,nom)|(?P<v>WW\()')
+_SENT_KEYS = {'f': ('f', 'f'), 'b': ('b', 'b'), 'n': ('n', 'n'),
+              'i': ('i', 'i'), 'a': ('a', 'a'), 'av': ('a', 'v'),
+              'nv': ('n', 'v'), 'v': ('v', 'v')}
+
+
 class DuSent(object):
     """Lexicon based sentiment features.
 
@@ -313,12 +363,22 @@ class DuSent(object):
     Based on code by Cynthia Van Hee, Marjan Van de Kauter, Orphée De Clercq
     """
 
+    lexicon = None
+
     def __init__(self):
         """Load the sentiment lexicon."""
         self.name = 'sentiment'
-        self.lexiconDict = pickle.load(
-            open(__file__.split('featurizer.py')[0] +
-                 '/data/sentilexicons.cpickle', 'rb'))
+        self.lexiconDict = self.load_lexicon()
+
+    @classmethod
+    def load_lexicon(cls):
+        """Unpickle the lexicon once, and share it between instances."""
+        if cls.lexicon is None:
+            import pickle
+            ldir = os.path.abspath(os.path.dirname(__file__)) + '/datasets/'
+            with open(ldir + 'sentilexicons.cpickle', 'rb') as f:
+                cls.lexicon = pickle.load(f)
+        return cls.lexicon
 
     def __str__(self):
         """Class string representation."""
@@ -332,30 +392,20 @@ class DuSent(object):
         Instance is a list of word-pos-lemma tuples that represent a token.
         """
         polarity_score = 0.0
-        token_dict = OrderedDict({
-            r'SPEC\(vreemd\)': ('f', 'f'),
-            r'BW\(\)': ('b', 'b'),
-            r'N\(': ('n', 'n'),
-            r'TWS\(\)': ('i', 'i'),
-            r'ADJ\(': ('a', 'a'),
-            r'WW\((od|vd).*(,prenom|,vrij)': ('a', 'v'),
-            r'WW\((od|vd).*,nom': ('n', 'v'),
-            r'WW\(inf,nom': ('n', 'v'),
-            r'WW\(': ('v', 'v')
-        })
+        search, lexicon = _SENT_TAGS.search, self.lexiconDict
         for parse in instance:
             try:
                 word, lemma, pos, _ = parse
             except ValueError:
                 exit("ERROR: DuSent relies on Frogged data!")
-            for regx, param in token_dict.items():
-                if re.search(regx, pos):
-                    if (word, param[0]) in self.lexiconDict:
-                        polarity_score += self.lexiconDict[(word, param[0])]
-                    elif (lemma, param[1]) in self.lexiconDict:
-                        polarity_score += self.lexiconDict[(lemma, param[1])]
-                    break
-                    # FIXME: reinclude the token numbers here
+            match = search(pos)
+            if match:
+                param = _SENT_KEYS[match.lastgroup]
+                score = lexicon.get((word, param[0]))
+                if score is None:
+                    score = lexicon.get((lemma, param[1]), 0.0)
+                polarity_score += score
+                # FIXME: reinclude the token numbers here
         return polarity_score
 
     def transform(self, _, parse):
@@ -363,6 +413,16 @@ class DuSent(object):
         return {self.name: self.calculate_sentiment(parse)}
 
 
+# NOTE: patterns live at module level so SimpleStats.__dict__ stays
+# serializable (see tools.serialize_sk)
+_PUNCTUATION = '!?.,:;()"\'-'
+_FLOODING = re.compile(r"((.)\2{2,})")
+_PUNC_SEQ = re.compile(r'[\!\?\.\,\:\;\(\)\"\'\-]+')
+_NUM_SEQ = re.compile(r'[0-9]+')
+_CAP_WORD = re.compile(r'[A-Z\-0-9]*[A-Z][A-Z\-0-9]*$')
+_START_CAP = re.compile(r'[A-Z][a-z]')
+
+
 class SimpleStats(object):
     r"""Word and token based features.
 
@@ -417,38 +477,39 @@ class SimpleStats(object):
 
     def text_based_feats(self, raw):
         """Include features that are based on the raw text."""
-        r_punc = r'[\!\?\.\,\:\;\(\)\"\'\-]'
         flood, flood_alph, flood_punc = [], [], []
 
-        for fl in re.findall(r"((.)\2{2,})", raw):
+        # NOTE: fl[1] is a single character, so membership tests suffice
+        for fl in _FLOODING.findall(raw):
             flood.append(len(fl[0]))
-            if re.search(r'^[a-zA-Z]+$', fl[1]):
+            if fl[1] in ascii_letters:
                 flood_alph.append(len(fl[0]))
-            if re.search(r_punc, fl[1]):
+            if fl[1] in _PUNCTUATION:
                 flood_punc.append(len(fl[0]))
-        # print(fl, fl_alph, fl_punc)
-        av = (np.mean(flood), np.mean(flood_alph), np.mean(flood_punc))
+        av = (np.mean(flood) if flood else 0,
+              np.mean(flood_alph) if flood_alph else 0,
+              np.mean(flood_punc) if flood_punc else 0)
 
         self.v.update({'flood_norm_len': len(flood),
                        'flood_alph_len': len(flood_alph),
                        'flood_punc_len': len(flood_punc),
-                       'flood_norm_avg': av[0] if str(av[0]) != 'nan' else 0,
-                       'flood_alph_avg': av[1] if str(av[1]) != 'nan' else 0,
-                       'flood_punc_avg': av[2] if str(av[2]) != 'nan' else 0,
-                       'num_punc': len(re.findall(r_punc + '+', raw)),
-                       'num_num': len(re.findall(r'[0-9]+', raw)),
-                       'num_emots': len(re.findall(r'_EMOTICON_', raw))})
+                       'flood_norm_avg': av[0],
+                       'flood_alph_avg': av[1],
+                       'flood_punc_avg': av[2],
+                       'num_punc': len(_PUNC_SEQ.findall(raw)),
+                       'num_num': len(_NUM_SEQ.findall(raw)),
+                       'num_emots': raw.count('_EMOTICON_')})
 
     def token_based_feats(self, tokens):
         """Include features that are based on certain tokens."""
         stats = {'word_len': 0, 'cap_words': 0, 'start_cap': 0,
                  'num_urls': 0, 'num_phots': 0, 'num_vids': 0}
-        r_cap = r'[A-Z\-0-9]*[A-Z][A-Z\-0-9]*$'
+        cap_word, start_cap = _CAP_WORD.findall, _START_CAP.findall
 
         for token in tokens:
             stats['word_len'] += len(token)
-            stats['cap_words'] += len(''.join(re.findall(r_cap, token)))
-            stats['start_cap'] += len(re.findall(r'[A-Z][a-z]', token))
+            stats['cap_words'] += len(''.join(cap_word(token)))
+            stats['start_cap'] += len(start_cap(token))
 
             # needs token parser
             if token == '__URL__':
@@ -463,8 +524,8 @@ class SimpleStats(object):
     @staticmethod
     def avg_sent_length(sentence_indices):
         """Calculate average sentence length."""
-        words_per_sent = Counter(sentence_indices)
-        return np.mean([val for _, val in words_per_sent.items()])
+        n_sents = len(set(sentence_indices))
+        return len(sentence_indices) / n_sents if n_sents else 0.0
 
     def transform(self, raw, parse):
         """Transform given instance into simple text features."""
@@ -473,10 +534,15 @@ class SimpleStats(object):
         try:
             if self.token:
                 assert parse
-                self.token_based_feats([p[0] for p in parse])
+                self.token_based_feats(_column(parse, 0))
             if self.stl:
                 assert parse
-                self.avg_sent_length([p[3] for p in parse])
+                # NOTE: only parses with sentence indices (Frog 4th column);
+                # self.v persists across documents, so clear it otherwise
+                self.v.pop('avg_sent_len', None)
+                if len(parse[0]) > 3:
+                    self.v['avg_sent_len'] = \
+                        self.avg_sent_length(_column(parse, 3))
         except AssertionError:
             exit("SimpleStats - No parses were found to extract token or " +
                  "sentence features from. Please provide or disable features.")